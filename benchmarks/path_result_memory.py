@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Measure peak memory of storing many PathResult objects.
+
+    python benchmarks/path_result_memory.py
+    python benchmarks/path_result_memory.py --count 100000 --hops 10 100 1000
+
+For each route length it runs one real search on a line graph, stores
+--count independent copies of the result and reports the tracemalloc peak.
+The "id list" row stores the same routes the way PathResult used to: a
+plain object whose path is a list of node ID strings.
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pathfinder_core import Graph, PathResult, dijkstra  # noqa: E402
+
+
+class IdListResult:
+    """Layout of PathResult before routes were stored as index arrays"""
+
+    def __init__(self, path, distance, nodes_visited, execution_time, algorithm):
+        self.path = path
+        self.distance = distance
+        self.nodes_visited = nodes_visited
+        self.execution_time = execution_time
+        self.algorithm = algorithm
+
+
+def line_graph(node_count: int) -> Graph:
+    graph = Graph()
+    for i in range(node_count):
+        graph.add_node(f"n{i}", f"Node {i}", float(i), 0.0)
+    for i in range(node_count - 1):
+        graph.add_edge(f"n{i}", f"n{i + 1}", 1.0)
+    return graph
+
+
+def peak_bytes(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    results = build()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=1_000_000)
+    parser.add_argument('--hops', type=int, nargs='+', default=[10, 100])
+    args = parser.parse_args()
+
+    print(f"{'hops':>6} {'layout':<12} {'peak MiB':>10} {'B/result':>10}")
+    for hops in args.hops:
+        graph = line_graph(hops)
+        result = dijkstra(graph, 'n0', f"n{hops - 1}")
+        assert result.path_length == hops
+        ids = result.node_ids(graph)
+        # Distance and timing are fresh floats per result, as in real batches
+        layouts = [
+            ('int array', lambda: [PathResult(array('i', result.trace), float(i), hops, i * 0.001,
+                                              result.algorithm, graph)
+                                   for i in range(args.count)]),
+            ('id list', lambda: [IdListResult(list(ids), float(i), hops, i * 0.001, result.algorithm)
+                                 for i in range(args.count)]),
+        ]
+        for name, build in layouts:
+            peak = peak_bytes(build)
+            print(f"{hops:>6} {name:<12} {peak / 2**20:>10.0f} {peak / args.count:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
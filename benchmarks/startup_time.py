@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Measure how long terminal_pathfinder.py takes to show its first prompt.
+
+    python benchmarks/startup_time.py
+    python benchmarks/startup_time.py --compare old_terminal_pathfinder.py
+    python benchmarks/startup_time.py -- --maps-dir /path/to/maps --prewarm
+
+Each run starts a fresh interpreter, waits for the "Enter command" prompt,
+then sends "exit". One warm-up run happens first so imported modules have
+their bytecode cached, as they would for a user; PYTHONDONTWRITEBYTECODE is
+dropped for the child processes so that cache can be written.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROMPT = 'Enter command'
+CHILD_ENV = {k: v for k, v in os.environ.items() if k != 'PYTHONDONTWRITEBYTECODE'}
+
+
+def time_to_prompt(script: str, script_args: list) -> float:
+    """Seconds from process start until the first prompt is printed"""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, script, *script_args], cwd=ROOT, env=CHILD_ENV,
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    seen = ''
+    while PROMPT not in seen:
+        char = proc.stdout.read(1)
+        if not char:
+            raise RuntimeError(f"{script} exited before showing a prompt")
+        seen += char
+    elapsed = time.perf_counter() - start
+    proc.communicate('exit\n')
+    return elapsed
+
+
+def measure(script: str, script_args: list, runs: int):
+    time_to_prompt(script, script_args)  # warm-up: fills __pycache__
+    samples = sorted(time_to_prompt(script, script_args) * 1000 for _ in range(runs))
+    print(f"{os.path.basename(script):<28} min {samples[0]:6.1f} ms   "
+          f"median {statistics.median(samples):6.1f} ms   ({runs} runs)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=15)
+    parser.add_argument('--compare', metavar='SCRIPT', help="Another script to time the same way")
+    parser.add_argument('script_args', nargs='*', help="Options passed to the script (after --)")
+    args = parser.parse_args()
+
+    measure(os.path.join(ROOT, 'terminal_pathfinder.py'), args.script_args, args.runs)
+    if args.compare:
+        measure(os.path.abspath(args.compare), args.script_args, args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1010 @@
+"""
+PathFinder Pro - graph model, pathfinding algorithms and map loading
+
+Used by terminal_pathfinder.py. It lives in its own module so Python caches
+its bytecode instead of recompiling it on every start of the script.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import os
+import threading
+import time
+import zlib
+from array import array
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterable
+
+# ============================================================================
+# Graph Data Structures
+# ============================================================================
+
+class GraphNode:
+    def __init__(self, id: str, name: str, x: float, y: float):
+        self.id = id
+        self.name = name
+        self.x = x
+        self.y = y
+    
+    def euclidean_distance(self, other: 'GraphNode') -> float:
+        """Calculate Euclidean distance to another node"""
+        return math.sqrt((self.x - other.x)**2 + (self.y - other.y)**2)
+    
+    def manhattan_distance(self, other: 'GraphNode') -> float:
+        """Calculate Manhattan distance to another node"""
+        return abs(self.x - other.x) + abs(self.y - other.y)
+
+
+class GraphEdge:
+    def __init__(self, from_id: str, to_id: str, weight: float):
+        self.from_id = from_id
+        self.to_id = to_id
+        self.weight = weight
+
+
+class Graph:
+    def __init__(self, directed: bool = False):
+        self.directed = directed
+        self.nodes: dict[str, GraphNode] = {}
+        self.adjacency_list: dict[str, list[GraphEdge]] = {}
+        # Dense integer index for each node, used for compact path storage
+        self.node_ids: list[str] = []
+        self.node_index: dict[str, int] = {}
+        self._node_ids_crc = 0
+        self._fingerprint: int | None = None
+    
+    def add_node(self, id: str, name: str, x: float, y: float):
+        """Add a node to the graph"""
+        if id not in self.node_index:
+            self.node_index[id] = len(self.node_ids)
+            self.node_ids.append(id)
+            self._node_ids_crc = zlib.crc32(id.encode() + b'\0', self._node_ids_crc)
+            self._fingerprint = None
+        self.nodes[id] = GraphNode(id, name, x, y)
+        self.adjacency_list[id] = []
+    
+    def add_edge(self, from_id: str, to_id: str, weight: float, bidirectional=True):
+        """Add an edge to the graph"""
+        edge = GraphEdge(from_id, to_id, weight)
+        self.adjacency_list[from_id].append(edge)
+        
+        if bidirectional:
+            reverse_edge = GraphEdge(to_id, from_id, weight)
+            self.adjacency_list[to_id].append(reverse_edge)
+    
+    def get_neighbors(self, node_id: str) -> list[GraphEdge]:
+        """Get all neighbors of a node"""
+        return self.adjacency_list.get(node_id, [])
+    
+    def get_node(self, node_id: str) -> GraphNode | None:
+        """Get node by ID"""
+        return self.nodes.get(node_id)
+    
+    def fingerprint(self) -> int:
+        """Stable identifier for the node index order (node count plus a CRC of node_ids)"""
+        if self._fingerprint is None:
+            self._fingerprint = (len(self.node_ids) << 32) | self._node_ids_crc
+        return self._fingerprint
+    
+    def connection_count(self) -> int:
+        """Number of connections (undirected graphs store each one in both directions)"""
+        total = sum(len(edges) for edges in self.adjacency_list.values())
+        return total if self.directed else total // 2
+
+
+# ============================================================================
+# Pathfinding Algorithms
+# ============================================================================
+
+class PathResult:
+    """
+    Result of a path search.
+    
+    The route is stored as an array of the graph's integer node indices
+    rather than a list of ID strings. The result does not keep the graph
+    itself, so it stays small when pickled and does not keep an evicted
+    map alive; IDs, names and coordinates are built on request from the
+    graph the search ran on. The graph's fingerprint is kept so the accessors
+    can refuse a graph whose node order differs from that one.
+    """
+    __slots__ = ('trace', 'graph_key', 'distance', 'nodes_visited', 'execution_time', 'algorithm')
+    
+    def __init__(self, path: Iterable, distance: float, nodes_visited: int,
+                 execution_time: float, algorithm: str, graph: Graph):
+        if isinstance(path, array):
+            self.trace = path if path.typecode == 'i' else array('i', path)
+        else:
+            self.trace = array('i', (graph.node_index[n] for n in path))
+        self.graph_key = graph.fingerprint()
+        self.distance = distance
+        self.nodes_visited = nodes_visited
+        self.execution_time = execution_time
+        self.algorithm = algorithm
+    
+    def __reduce__(self):
+        return (_restore_path_result, (self.trace, self.graph_key, self.distance,
+                                       self.nodes_visited, self.execution_time, self.algorithm))
+    
+    def _check_graph(self, graph: Graph):
+        if graph.fingerprint() != self.graph_key:
+            raise ValueError("PathResult was computed on a different graph (node order does not match)")
+    
+    @property
+    def path_length(self) -> int:
+        """Number of nodes on the route"""
+        return len(self.trace)
+    
+    def node_ids(self, graph: Graph) -> list[str]:
+        """Node IDs along the route"""
+        self._check_graph(graph)
+        node_ids = graph.node_ids
+        return [node_ids[i] for i in self.trace]
+    
+    def path(self, graph: Graph) -> list[str]:
+        """Node IDs along the route (deprecated alias of node_ids)"""
+        import warnings
+        
+        warnings.warn("PathResult.path() is deprecated; use node_ids(graph)",
+                      DeprecationWarning, stacklevel=2)
+        return self.node_ids(graph)
+    
+    def nodes(self, graph: Graph) -> list[GraphNode]:
+        """Graph nodes along the route"""
+        self._check_graph(graph)
+        node_ids, nodes = graph.node_ids, graph.nodes
+        return [nodes[node_ids[i]] for i in self.trace]
+    
+    def names(self, graph: Graph) -> list[str]:
+        """Node names along the route"""
+        return [node.name for node in self.nodes(graph)]
+    
+    def coordinates(self, graph: Graph) -> list[tuple[float, float]]:
+        """(y, x) coordinates along the route, i.e. (lat, lon) for geographic maps"""
+        return [(node.y, node.x) for node in self.nodes(graph)]
+    
+    def encoded_polyline(self, graph: Graph, precision: int = 5) -> str:
+        """Route geometry in the encoded polyline format"""
+        return encode_polyline(self.coordinates(graph), precision)
+    
+    def delta_varint(self, graph: Graph, precision: int = 5) -> bytes:
+        """Route geometry as zigzag delta varints"""
+        return encode_delta_varint(self.coordinates(graph), precision)
+
+
+def _restore_path_result(trace: array, graph_key: int, distance: float, nodes_visited: int,
+                         execution_time: float, algorithm: str) -> PathResult:
+    """Rebuild a pickled PathResult without needing its graph"""
+    result = PathResult.__new__(PathResult)
+    result.trace = trace
+    result.graph_key = graph_key
+    result.distance = distance
+    result.nodes_visited = nodes_visited
+    result.execution_time = execution_time
+    result.algorithm = algorithm
+    return result
+
+
+def trace_path(graph: Graph, previous: dict[str, str | None], source_id: str, dest_id: str) -> array:
+    """Follow the predecessor chain back from dest_id; empty if it does not reach source_id"""
+    node_index = graph.node_index
+    trace = array('i')
+    current = dest_id
+    while current is not None:
+        trace.append(node_index[current])
+        current = previous.get(current)
+    trace.reverse()
+    
+    if not trace or trace[0] != node_index[source_id]:
+        return array('i')
+    return trace
+
+
+def dijkstra(graph: Graph, source_id: str, dest_id: str) -> PathResult:
+    """Dijkstra's shortest path algorithm"""
+    start_time = time.time()
+    
+    distances = {node_id: float('inf') for node_id in graph.nodes}
+    distances[source_id] = 0
+    previous = {node_id: None for node_id in graph.nodes}
+    
+    pq = [(0, source_id)]
+    visited = set()
+    nodes_visited = 0
+    
+    while pq:
+        current_dist, current_id = heapq.heappop(pq)
+        
+        if current_id in visited:
+            continue
+        
+        visited.add(current_id)
+        nodes_visited += 1
+        
+        if current_id == dest_id:
+            break
+        
+        for edge in graph.get_neighbors(current_id):
+            neighbor_id = edge.to_id
+            new_dist = current_dist + edge.weight
+            
+            if new_dist < distances[neighbor_id]:
+                distances[neighbor_id] = new_dist
+                previous[neighbor_id] = current_id
+                heapq.heappush(pq, (new_dist, neighbor_id))
+    
+    # Reconstruct path
+    path = trace_path(graph, previous, source_id, dest_id)
+    
+    execution_time = (time.time() - start_time) * 1000  # Convert to ms
+    
+    return PathResult(
+        path,
+        distances[dest_id],
+        nodes_visited,
+        execution_time,
+        "Dijkstra",
+        graph
+    )
+
+
+def astar(graph: Graph, source_id: str, dest_id: str, heuristic='euclidean') -> PathResult:
+    """A* search algorithm"""
+    start_time = time.time()
+    
+    def h(node_id: str) -> float:
+        """Heuristic function"""
+        node = graph.get_node(node_id)
+        goal = graph.get_node(dest_id)
+        if heuristic == 'manhattan':
+            return node.manhattan_distance(goal)
+        else:  # euclidean
+            return node.euclidean_distance(goal)
+    
+    g_score = {node_id: float('inf') for node_id in graph.nodes}
+    g_score[source_id] = 0
+    
+    f_score = {node_id: float('inf') for node_id in graph.nodes}
+    f_score[source_id] = h(source_id)
+    
+    previous = {node_id: None for node_id in graph.nodes}
+    
+    open_set = [(f_score[source_id], source_id)]
+    closed_set = set()
+    nodes_visited = 0
+    
+    while open_set:
+        _, current_id = heapq.heappop(open_set)
+        
+        if current_id in closed_set:
+            continue
+        
+        closed_set.add(current_id)
+        nodes_visited += 1
+        
+        if current_id == dest_id:
+            break
+        
+        for edge in graph.get_neighbors(current_id):
+            neighbor_id = edge.to_id
+            
+            if neighbor_id in closed_set:
+                continue
+            
+            tentative_g = g_score[current_id] + edge.weight
+            
+            if tentative_g < g_score[neighbor_id]:
+                previous[neighbor_id] = current_id
+                g_score[neighbor_id] = tentative_g
+                f_score[neighbor_id] = tentative_g + h(neighbor_id)
+                heapq.heappush(open_set, (f_score[neighbor_id], neighbor_id))
+    
+    # Reconstruct path
+    path = trace_path(graph, previous, source_id, dest_id)
+    
+    execution_time = (time.time() - start_time) * 1000
+    
+    return PathResult(
+        path,
+        g_score[dest_id],
+        nodes_visited,
+        execution_time,
+        f"A* ({heuristic})",
+        graph
+    )
+
+
+def bfs(graph: Graph, source_id: str, dest_id: str) -> PathResult:
+    """Breadth-First Search"""
+    start_time = time.time()
+    
+    queue = deque([source_id])
+    visited = {source_id}
+    previous = {source_id: None}
+    distances = {source_id: 0}
+    nodes_visited = 0
+    
+    while queue:
+        current_id = queue.popleft()
+        nodes_visited += 1
+        
+        if current_id == dest_id:
+            break
+        
+        for edge in graph.get_neighbors(current_id):
+            neighbor_id = edge.to_id
+            
+            if neighbor_id not in visited:
+                visited.add(neighbor_id)
+                previous[neighbor_id] = current_id
+                distances[neighbor_id] = distances[current_id] + edge.weight
+                queue.append(neighbor_id)
+    
+    # Reconstruct path
+    path = trace_path(graph, previous, source_id, dest_id)
+    
+    execution_time = (time.time() - start_time) * 1000
+    
+    return PathResult(
+        path,
+        distances.get(dest_id, -1),
+        nodes_visited,
+        execution_time,
+        "BFS",
+        graph
+    )
+
+
+def dfs(graph: Graph, source_id: str, dest_id: str) -> PathResult:
+    """Depth-First Search"""
+    start_time = time.time()
+    
+    visited = set()
+    previous = {source_id: None}
+    distances = {source_id: 0}
+    nodes_visited = [0]  # Use list to allow modification in nested function
+    
+    def dfs_visit(current_id: str, current_dist: float) -> bool:
+        visited.add(current_id)
+        nodes_visited[0] += 1
+        
+        if current_id == dest_id:
+            return True
+        
+        for edge in graph.get_neighbors(current_id):
+            neighbor_id = edge.to_id
+            
+            if neighbor_id not in visited:
+                previous[neighbor_id] = current_id
+                distances[neighbor_id] = current_dist + edge.weight
+                
+                if dfs_visit(neighbor_id, current_dist + edge.weight):
+                    return True
+        
+        return False
+    
+    found = dfs_visit(source_id, 0)
+    
+    # Reconstruct path
+    path = trace_path(graph, previous, source_id, dest_id) if found else array('i')
+    
+    execution_time = (time.time() - start_time) * 1000
+    
+    return PathResult(
+        path,
+        distances.get(dest_id, -1) if found else -1,
+        nodes_visited[0],
+        execution_time,
+        "DFS",
+        graph
+    )
+
+
+# ============================================================================
+# Route Encoding
+# ============================================================================
+
+def _zigzag(value: int) -> int:
+    return ~(value << 1) if value < 0 else value << 1
+
+
+def _unzigzag(value: int) -> int:
+    return ~(value >> 1) if value & 1 else value >> 1
+
+
+def _quantized_deltas(points: Iterable[tuple[float, float]], precision: int):
+    """Yield coordinate deltas as integers scaled by 10**precision"""
+    factor = 10 ** precision
+    prev_a = prev_b = 0
+    for a, b in points:
+        a, b = round(a * factor), round(b * factor)
+        yield a - prev_a
+        yield b - prev_b
+        prev_a, prev_b = a, b
+
+
+def _pairs_from_deltas(deltas: list[int], precision: int) -> list[tuple[float, float]]:
+    factor = 10 ** precision
+    points = []
+    a = b = 0
+    for i in range(0, len(deltas) - 1, 2):
+        a += deltas[i]
+        b += deltas[i + 1]
+        points.append((a / factor, b / factor))
+    return points
+
+
+def encode_polyline(points: Iterable[tuple[float, float]], precision: int = 5) -> str:
+    """Encode (lat, lon) points with the encoded polyline algorithm"""
+    chunks = []
+    for delta in _quantized_deltas(points, precision):
+        value = _zigzag(delta)
+        while value >= 0x20:
+            chunks.append(chr((0x20 | (value & 0x1f)) + 63))
+            value >>= 5
+        chunks.append(chr(value + 63))
+    return ''.join(chunks)
+
+
+def decode_polyline(encoded: str, precision: int = 5) -> list[tuple[float, float]]:
+    """Decode an encoded polyline back into (lat, lon) points"""
+    deltas = []
+    value = shift = 0
+    for char in encoded:
+        byte = ord(char) - 63
+        value |= (byte & 0x1f) << shift
+        shift += 5
+        if byte < 0x20:
+            deltas.append(_unzigzag(value))
+            value = shift = 0
+    return _pairs_from_deltas(deltas, precision)
+
+
+def encode_delta_varint(points: Iterable[tuple[float, float]], precision: int = 5) -> bytes:
+    """Encode (lat, lon) points as zigzag delta varints (7 bits per byte)"""
+    out = bytearray()
+    for delta in _quantized_deltas(points, precision):
+        value = _zigzag(delta)
+        while value >= 0x80:
+            out.append(0x80 | (value & 0x7f))
+            value >>= 7
+        out.append(value)
+    return bytes(out)
+
+
+def decode_delta_varint(data: bytes, precision: int = 5) -> list[tuple[float, float]]:
+    """Decode zigzag delta varints back into (lat, lon) points"""
+    deltas = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7f) << shift
+        shift += 7
+        if byte < 0x80:
+            deltas.append(_unzigzag(value))
+            value = shift = 0
+    return _pairs_from_deltas(deltas, precision)
+
+
+# ============================================================================
+# Map Data
+# ============================================================================
+
+def load_usa_map() -> Graph:
+    """Load USA cities map"""
+    graph = Graph()
+    
+    # Add nodes (cities)
+    cities = [
+        ('nyc', 'New York', 850, 300),
+        ('la', 'Los Angeles', 150, 450),
+        ('chicago', 'Chicago', 650, 280),
+        ('houston', 'Houston', 450, 550),
+        ('phoenix', 'Phoenix', 250, 500),
+        ('philadelphia', 'Philadelphia', 820, 320),
+        ('san_diego', 'San Diego', 120, 520),
+        ('dallas', 'Dallas', 450, 520),
+        ('san_jose', 'San Jose', 100, 380),
+        ('austin', 'Austin', 420, 580),
+        ('seattle', 'Seattle', 110, 150),
+        ('denver', 'Denver', 350, 340),
+        ('boston', 'Boston', 880, 260),
+        ('miami', 'Miami', 780, 680),
+        ('las_vegas', 'Las Vegas', 200, 420),
+    ]
+    
+    for city_id, name, x, y in cities:
+        graph.add_node(city_id, name, x, y)
+    
+    # Add edges (connections with distances in km)
+    edges = [
+        ('nyc', 'philadelphia', 95),
+        ('nyc', 'boston', 215),
+        ('philadelphia', 'boston', 310),
+        ('chicago', 'denver', 920),
+        ('houston', 'dallas', 240),
+        ('dallas', 'austin', 195),
+        ('la', 'san_diego', 120),
+        ('la', 'phoenix', 370),
+        ('san_diego', 'phoenix', 355),
+        ('seattle', 'denver', 1300),
+        ('denver', 'las_vegas', 750),
+        ('denver', 'phoenix', 600),
+        ('las_vegas', 'la', 270),
+        ('houston', 'phoenix', 1180),
+        ('dallas', 'denver', 780),
+        ('chicago', 'nyc', 790),
+        ('miami', 'houston', 1190),
+    ]
+    
+    for from_id, to_id, distance in edges:
+        graph.add_edge(from_id, to_id, distance)
+    
+    return graph
+
+
+def load_europe_map() -> Graph:
+    """Load European cities map"""
+    graph = Graph()
+    
+    # Add nodes (cities)
+    cities = [
+        ('london', 'London', 400, 250),
+        ('paris', 'Paris', 420, 300),
+        ('berlin', 'Berlin', 550, 220),
+        ('madrid', 'Madrid', 320, 400),
+        ('rome', 'Rome', 550, 420),
+        ('barcelona', 'Barcelona', 380, 420),
+        ('amsterdam', 'Amsterdam', 450, 220),
+        ('vienna', 'Vienna', 600, 300),
+        ('prague', 'Prague', 570, 260),
+        ('budapest', 'Budapest', 620, 320),
+        ('warsaw', 'Warsaw', 650, 220),
+        ('brussels', 'Brussels', 440, 260),
+        ('munich', 'Munich', 530, 300),
+        ('milan', 'Milan', 500, 360),
+        ('zurich', 'Zurich', 490, 320),
+    ]
+    
+    for city_id, name, x, y in cities:
+        graph.add_node(city_id, name, x, y)
+    
+    # Add edges (connections with distances in km)
+    edges = [
+        ('london', 'paris', 340),
+        ('london', 'amsterdam', 360),
+        ('london', 'brussels', 320),
+        ('paris', 'brussels', 265),
+        ('paris', 'barcelona', 830),
+        ('paris', 'zurich', 490),
+        ('barcelona', 'madrid', 505),
+        ('madrid', 'paris', 1050),
+        ('rome', 'milan', 480),
+        ('rome', 'vienna', 765),
+        ('milan', 'zurich', 220),
+        ('milan', 'munich', 410),
+        ('berlin', 'amsterdam', 580),
+        ('berlin', 'prague', 280),
+        ('berlin', 'warsaw', 520),
+        ('berlin', 'munich', 505),
+        ('prague', 'vienna', 250),
+        ('prague', 'munich', 305),
+        ('vienna', 'budapest', 215),
+        ('vienna', 'munich', 355),
+        ('budapest', 'warsaw', 545),
+        ('amsterdam', 'brussels', 175),
+        ('brussels', 'zurich', 520),
+    ]
+    
+    for from_id, to_id, distance in edges:
+        graph.add_edge(from_id, to_id, distance)
+    
+    return graph
+
+
+def load_india_map() -> Graph:
+    """Load Indian cities map"""
+    graph = Graph()
+    
+    # Add nodes (cities)
+    cities = [
+        ('delhi', 'New Delhi', 500, 200),
+        ('mumbai', 'Mumbai', 400, 350),
+        ('bangalore', 'Bangalore', 450, 500),
+        ('hyderabad', 'Hyderabad', 500, 450),
+        ('chennai', 'Chennai', 520, 550),
+        ('kolkata', 'Kolkata', 650, 300),
+        ('pune', 'Pune', 420, 380),
+        ('ahmedabad', 'Ahmedabad', 380, 280),
+        ('jaipur', 'Jaipur', 450, 230),
+        ('lucknow', 'Lucknow', 550, 240),
+        ('chandigarh', 'Chandigarh', 480, 180),
+        ('kochi', 'Kochi', 420, 600),
+        ('indore', 'Indore', 450, 300),
+        ('bhopal', 'Bhopal', 480, 290),
+        ('nagpur', 'Nagpur', 520, 370),
+    ]
+    
+    for city_id, name, x, y in cities:
+        graph.add_node(city_id, name, x, y)
+    
+    # Add edges (connections with distances in km)
+    edges = [
+        ('delhi', 'jaipur', 280),
+        ('delhi', 'chandigarh', 245),
+        ('delhi', 'lucknow', 555),
+        ('delhi', 'ahmedabad', 935),
+        ('jaipur', 'ahmedabad', 680),
+        ('ahmedabad', 'mumbai', 525),
+        ('ahmedabad', 'indore', 390),
+        ('mumbai', 'pune', 150),
+        ('mumbai', 'bangalore', 985),
+        ('pune', 'bangalore', 840),
+        ('pune', 'hyderabad', 560),
+        ('bangalore', 'hyderabad', 575),
+        ('bangalore', 'chennai', 350),
+        ('bangalore', 'kochi', 560),
+        ('chennai', 'hyderabad', 625),
+        ('chennai', 'kochi', 695),
+        ('hyderabad', 'nagpur', 500),
+        ('nagpur', 'mumbai', 800),
+        ('nagpur', 'bhopal', 350),
+        ('indore', 'bhopal', 195),
+        ('bhopal', 'delhi', 740),
+        ('lucknow', 'kolkata', 985),
+        ('kolkata', 'delhi', 1450),
+    ]
+    
+    for from_id, to_id, distance in edges:
+        graph.add_edge(from_id, to_id, distance)
+    
+    return graph
+
+
+# ============================================================================
+# Map File Loaders
+# ============================================================================
+
+SNAPSHOT_EXTENSION = '.pfsnap'
+
+
+def _require_nodes(graph: Graph, path: str) -> Graph:
+    """Reject map files that produce an empty graph"""
+    if not graph.nodes:
+        raise ValueError(f"{path}: map has no nodes")
+    return graph
+
+
+def load_map_txt(path: str) -> Graph:
+    """Load a map in the RoutingEngine map.txt format (NODES/EDGES sections)"""
+    # Edges in map.txt are directed, same as the C++ engine
+    graph = Graph(directed=True)
+    
+    with open(path) as f:
+        tokens = f.read().split()
+    
+    pos = 0
+    
+    def take(count: int, section: str) -> list[str]:
+        nonlocal pos
+        if pos + count > len(tokens):
+            raise ValueError(f"{path}: {section} section is truncated")
+        fields = tokens[pos:pos + count]
+        pos += count
+        return fields
+    
+    while pos < len(tokens):
+        section = take(1, 'header')[0]
+        if section not in ('NODES', 'EDGES'):
+            continue
+        
+        count_field = take(1, section)[0]
+        if not count_field.isdigit():
+            raise ValueError(f"{path}: {section} count is not a number: {count_field!r}")
+        
+        for _ in range(int(count_field)):
+            fields = take(4 if section == 'NODES' else 3, section)
+            try:
+                if section == 'NODES':
+                    node_id, name, lat, lon = fields
+                    graph.add_node(node_id, name, float(lon), float(lat))
+                else:
+                    from_id, to_id, weight = fields
+                    if from_id not in graph.nodes or to_id not in graph.nodes:
+                        raise ValueError("unknown node")
+                    graph.add_edge(from_id, to_id, float(weight), bidirectional=False)
+            except ValueError:
+                raise ValueError(f"{path}: malformed {section} entry: {' '.join(fields)}") from None
+    
+    return _require_nodes(graph, path)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two coordinates in km"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2)**2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2)**2
+    return 6371.0 * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def load_osm(path: str) -> Graph:
+    """Load the highway network from a small OSM XML extract"""
+    import xml.etree.ElementTree as ET  # only needed when an OSM map is used
+    
+    graph = Graph()
+    root = None
+    
+    for event, elem in ET.iterparse(path, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = elem
+            continue
+        
+        if elem.tag == 'node':
+            node_id = elem.get('id')
+            graph.add_node(node_id, node_id, float(elem.get('lon')), float(elem.get('lat')))
+        elif elem.tag == 'way':
+            is_highway = any(tag.get('k') == 'highway' for tag in elem.iter('tag'))
+            refs = [nd.get('ref') for nd in elem.iter('nd')]
+            if is_highway:
+                for a, b in zip(refs, refs[1:]):
+                    node_a, node_b = graph.get_node(a), graph.get_node(b)
+                    if node_a is None or node_b is None:
+                        continue
+                    graph.add_edge(a, b, haversine_km(node_a.y, node_a.x, node_b.y, node_b.x))
+        elif elem.tag != 'relation':
+            continue
+        
+        # Drop finished top-level elements so memory does not grow with the extract
+        root.clear()
+    
+    return _require_nodes(graph, path)
+
+
+def save_snapshot(graph: Graph, path: str):
+    """Save a graph as a JSON snapshot of its nodes and edges"""
+    import json
+    
+    data = {
+        'directed': graph.directed,
+        'nodes': [[node.id, node.name, node.x, node.y] for node in graph.nodes.values()],
+        'edges': [[edge.from_id, edge.to_id, edge.weight]
+                  for edges in graph.adjacency_list.values() for edge in edges],
+    }
+    with open(path, 'w') as f:
+        json.dump(data, f, separators=(',', ':'))
+
+
+def load_snapshot(path: str) -> Graph:
+    """Load a graph saved with save_snapshot"""
+    import json
+    
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        graph = Graph(directed=bool(data['directed']))
+        for node_id, name, x, y in data['nodes']:
+            graph.add_node(str(node_id), str(name), float(x), float(y))
+        # Every stored edge is one direction of a connection
+        for from_id, to_id, weight in data['edges']:
+            if from_id not in graph.nodes or to_id not in graph.nodes:
+                raise ValueError("unknown node")
+            graph.add_edge(from_id, to_id, float(weight), bidirectional=False)
+    except (KeyError, TypeError, ValueError, UnicodeDecodeError):
+        raise ValueError(f"{path}: not a valid map snapshot") from None
+    
+    return _require_nodes(graph, path)
+
+
+# ============================================================================
+# Map Registry
+# ============================================================================
+
+# Rough per-object costs used to estimate how much memory a loaded graph holds
+NODE_BYTES = 400
+EDGE_BYTES = 180
+
+
+def estimate_graph_bytes(graph: Graph) -> int:
+    """Estimate the memory held by a graph"""
+    edge_count = sum(len(edges) for edges in graph.adjacency_list.values())
+    return len(graph.nodes) * NODE_BYTES + edge_count * EDGE_BYTES
+
+
+class MapSource:
+    def __init__(self, key: str, label: str, loader: Callable[[], Graph], kind: str,
+                 path: str | None = None):
+        self.key = key
+        self.label = label
+        self.loader = loader
+        self.kind = kind
+        self.path = path
+        self.load_lock = threading.Lock()
+
+
+class MapRegistry:
+    """
+    Known map sources plus a bounded LRU set of loaded graphs.
+    
+    Registering a map or adding a search directory never loads anything:
+    directories are scanned the first time the list of maps is needed, and
+    a graph is built the first time get() asks for it. Loaded graphs stay
+    resident until evicted, either because more than max_resident graphs
+    are loaded or because their estimated size exceeds memory_budget bytes.
+    """
+    
+    def __init__(self, max_resident: int = 3, memory_budget: int = 256 * 1024 * 1024):
+        self.max_resident = max(1, max_resident)
+        self.memory_budget = memory_budget
+        self._sources: dict[str, MapSource] = {}
+        self._paths: set[str] = set()
+        self._pending_dirs: list[str] = []
+        self._resident: OrderedDict[str, tuple[Graph, int]] = OrderedDict()
+        self._resident_bytes = 0
+        self._lock = threading.Lock()
+        self._scan_lock = threading.Lock()
+    
+    def register(self, key: str, label: str, loader: Callable[[], Graph], kind: str = 'builtin',
+                 path: str | None = None) -> MapSource:
+        """Register a map source without loading it"""
+        base, n = key, 2
+        while key in self._sources:
+            key = f"{base}_{n}"
+            n += 1
+        source = MapSource(key, label, loader, kind, path)
+        self._sources[key] = source
+        return source
+    
+    def add_directory(self, directory: str):
+        """Search a directory for map.txt, OSM and snapshot files once maps are listed"""
+        self._pending_dirs.append(directory)
+    
+    def _scan(self):
+        with self._scan_lock:
+            while self._pending_dirs:
+                self.discover(self._pending_dirs.pop(0))
+    
+    def discover(self, directory: str):
+        """Register map.txt, OSM and snapshot files found in a directory"""
+        try:
+            entries = sorted(os.scandir(directory), key=lambda e: e.name)
+        except OSError:
+            return
+        
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            name = entry.name
+            if name == 'map.txt' or name.endswith('.map.txt'):
+                stem = os.path.basename(os.path.abspath(directory)) if name == 'map.txt' else name[:-len('.map.txt')]
+                self._register_file(stem, entry.path, 'map.txt', load_map_txt)
+            elif name.endswith('.osm'):
+                self._register_file(name[:-len('.osm')], entry.path, 'osm', load_osm)
+            elif name.endswith(SNAPSHOT_EXTENSION):
+                self._register_file(name[:-len(SNAPSHOT_EXTENSION)], entry.path, 'snapshot', load_snapshot)
+    
+    def _register_file(self, stem: str, path: str, kind: str, loader: Callable[[str], Graph]):
+        if path in self._paths:
+            return
+        self._paths.add(path)
+        key = stem.lower().replace(' ', '_')
+        self.register(key, f"{stem} ({kind})", lambda: loader(path), kind, path)
+    
+    def keys(self) -> list[str]:
+        """Keys of all known maps, scanning any pending directories first"""
+        self._scan()
+        return list(self._sources)
+    
+    def source(self, key: str) -> MapSource:
+        """Look up a map source by key"""
+        if key not in self._sources:
+            self._scan()
+        return self._sources[key]
+    
+    def is_loaded(self, key: str) -> bool:
+        """Check whether a map is currently resident"""
+        with self._lock:
+            return key in self._resident
+    
+    def resident_keys(self) -> list[str]:
+        """Keys of resident maps, least recently used first"""
+        with self._lock:
+            return list(self._resident)
+    
+    def get(self, key: str) -> Graph:
+        """Return the graph for a map, loading it on first use"""
+        return self._load(key, recent=True)
+    
+    def _load(self, key: str, recent: bool) -> Graph:
+        source = self.source(key)
+        
+        with self._lock:
+            if key in self._resident:
+                if recent:
+                    self._resident.move_to_end(key)
+                return self._resident[key][0]
+        
+        # Loading happens outside the registry lock so a background prewarm
+        # never blocks lookups of maps that are already resident
+        with source.load_lock:
+            with self._lock:
+                if key in self._resident:
+                    if recent:
+                        self._resident.move_to_end(key)
+                    return self._resident[key][0]
+            
+            graph = source.loader()
+            size = estimate_graph_bytes(graph)
+            
+            with self._lock:
+                self._resident[key] = (graph, size)
+                self._resident_bytes += size
+                if recent:
+                    self._evict(keep=key)
+                else:
+                    self._resident.move_to_end(key, last=False)
+                    self._evict(keep=None)
+        
+        return graph
+    
+    def _evict(self, keep: str | None):
+        """Drop least recently used graphs until within limits (lock held)"""
+        while len(self._resident) > 1 and (len(self._resident) > self.max_resident
+                                           or self._resident_bytes > self.memory_budget):
+            oldest = next(iter(self._resident))
+            if oldest == keep:
+                self._resident.move_to_end(oldest)
+                continue
+            _, size = self._resident.pop(oldest)
+            self._resident_bytes -= size
+    
+    def _has_room(self) -> bool:
+        with self._lock:
+            return len(self._resident) < self.max_resident and self._resident_bytes < self.memory_budget
+    
+    def prewarm(self, keys: list[str] | None = None) -> threading.Thread:
+        """
+        Load maps in a background thread while there is room for them.
+        
+        Prewarmed graphs are placed at the least recently used end, so if a
+        graph turns out larger than the remaining budget it is the one dropped
+        rather than a map the user has already opened. Maps that fail to load
+        are skipped; the error shows up if the user selects them.
+        """
+        def run():
+            for key in self.keys() if keys is None else keys:
+                if not self._has_room():
+                    break
+                try:
+                    self._load(key, recent=False)
+                except Exception:
+                    continue
+        
+        thread = threading.Thread(target=run, name='map-prewarm', daemon=True)
+        thread.start()
+        return thread
+
+
+def default_map_dirs() -> list[str]:
+    """Directories searched for map files"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    dirs = [os.path.join(here, 'maps'), os.path.join(here, 'RoutingEngine', 'sample')]
+    extra = os.environ.get('PATHFINDER_MAPS')
+    if extra:
+        dirs.extend(d for d in extra.split(os.pathsep) if d)
+    return dirs
+
+
+def build_map_registry(map_dirs: list[str] | None = None, max_resident: int = 3,
+                       memory_budget: int = 256 * 1024 * 1024) -> MapRegistry:
+    """Create a registry with the built-in maps and any map files found on disk"""
+    registry = MapRegistry(max_resident, memory_budget)
+    registry.register('usa', 'USA Major Cities', load_usa_map)
+    registry.register('europe', 'European Cities', load_europe_map)
+    registry.register('india', 'Indian Cities', load_india_map)
+    
+    for directory in default_map_dirs() if map_dirs is None else map_dirs:
+        registry.add_directory(directory)
+    
+    return registry